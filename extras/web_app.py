@@ -16,6 +16,7 @@ import queue
 import threading
 import ipaddress
 import socket
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 # requests is a core OneFileLLM dependency. Its PreparedRequest URL normaliser
@@ -31,10 +32,37 @@ _REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _REPO_ROOT not in sys.path:
     sys.path.insert(0, _REPO_ROOT)
 
-from onefilellm import process_github_repo, process_github_pull_request, process_github_issue
-from onefilellm import process_arxiv_pdf, fetch_youtube_transcript
-from onefilellm import crawl_and_extract_text, process_doi_or_pmid
-from onefilellm import get_token_count, preprocess_text, safe_file_read, TOKEN_ESTIMATE_MULTIPLIER
+# onefilellm drags in the heavy imports (tiktoken, bs4, rich, dotenv), which a
+# process that only serves the shell/static/download routes never needs. Load
+# it lazily: first touch of any re-exported name — attribute access via the
+# PEP 562 __getattr__ below, or _ensure_onefilellm() at the entry points that
+# use these names as plain globals — binds them all into module globals. Tests
+# that monkeypatch these names on this module keep working: the patch's own
+# attribute lookup triggers the bind first.
+_ONEFILELLM_EXPORTS = (
+    "process_github_repo", "process_github_pull_request", "process_github_issue",
+    "process_arxiv_pdf", "fetch_youtube_transcript",
+    "crawl_and_extract_text", "process_doi_or_pmid",
+    "get_token_count", "preprocess_text", "safe_file_read",
+    "TOKEN_ESTIMATE_MULTIPLIER",
+)
+
+
+def _ensure_onefilellm():
+    """Bind the onefilellm exports into module globals (idempotent, cheap)."""
+    g = globals()
+    if "process_doi_or_pmid" in g:
+        return
+    import onefilellm
+    for name in _ONEFILELLM_EXPORTS:
+        g.setdefault(name, getattr(onefilellm, name))
+
+
+def __getattr__(name):
+    if name in _ONEFILELLM_EXPORTS:
+        _ensure_onefilellm()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 app = Flask(__name__)
 
@@ -64,6 +92,12 @@ APP_VERSION = None
 # ---------------------------------------------------------------------------
 _job_lock = threading.Lock()
 
+# Persistent job worker. Single-flight jobs (guarded by _job_lock) mean one
+# reusable thread is enough. Pool threads are non-daemon and joined at
+# interpreter exit, so any subprocess a processor spawns must be bounded
+# (see YT_DLP_TIMEOUT in onefilellm.py) or shutdown could hang.
+_WORKER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="onefilellm-job")
+
 
 # Hostnames that denote the local/internal host without being IP literals (so a
 # pure-IP check would miss them). Includes the Debian/Ubuntu IPv6 loopback aliases
@@ -130,14 +164,33 @@ def _host_ip_candidates(host):
     return candidates
 
 
+# Resolver cache for _resolved_addresses. A short TTL (not a per-process
+# lru_cache) keeps the resolve-and-revalidate defense live: a host is
+# re-resolved at most _RESOLVE_TTL seconds after its last lookup, so a DNS
+# flip to a private address (the nip.io/localtest.me rebinding class) is
+# caught on the next submit instead of never. Failed resolutions are not
+# cached at all — a transient gaierror must not pin the fail-open result.
+_RESOLVE_TTL = 30.0
+_RESOLVE_CACHE = {}
+_RESOLVE_CACHE_LOCK = threading.Lock()
+
+
 def _resolved_addresses(host):
     """Resolve a hostname to ipaddress objects (best-effort, never raises).
 
-    Returns an empty list on resolution failure — we fail OPEN, because a host we
-    cannot resolve cannot be connected to either (the fetch will simply error),
-    and that keeps offline/air-gapped use working. Catches public names that map
-    to internal IPs (e.g. ``*.nip.io``, ``localtest.me``, ``ip6-localhost``).
+    Returns an empty tuple on resolution failure — we fail OPEN, because a host
+    we cannot resolve cannot be connected to either (the fetch will simply
+    error), and that keeps offline/air-gapped use working. Catches public names
+    that map to internal IPs (e.g. ``*.nip.io``, ``localtest.me``,
+    ``ip6-localhost``). Successful lookups are cached for _RESOLVE_TTL seconds:
+    validation re-runs on every submit of the same host, and getaddrinfo is by
+    far its slowest step.
     """
+    now = time.monotonic()
+    with _RESOLVE_CACHE_LOCK:
+        cached = _RESOLVE_CACHE.get(host)
+        if cached is not None and now - cached[0] < _RESOLVE_TTL:
+            return cached[1]
     addrs = []
     try:
         for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP):
@@ -147,6 +200,12 @@ def _resolved_addresses(host):
                 pass
     except Exception:
         pass
+    addrs = tuple(addrs)
+    if addrs:
+        with _RESOLVE_CACHE_LOCK:
+            if len(_RESOLVE_CACHE) >= 256:
+                _RESOLVE_CACHE.clear()
+            _RESOLVE_CACHE[host] = (now, addrs)
     return addrs
 
 
@@ -249,6 +308,18 @@ def _security_check(input_path):
 # ---------------------------------------------------------------------------
 # Shared algorithms (contract §7.1 classify, §7.2 metrics, §7.3 nodes).
 # ---------------------------------------------------------------------------
+# Shared immutable classify() results — the non-error outcomes are always the
+# same pair, so hand back one instance instead of allocating per call.
+_CLASSIFY_EMPTY = ("empty", None)
+_CLASSIFY_SUCCESS = ("success", None)
+
+# classify() runs on every job's full (potentially multi-MB) output; compile its
+# probes once. Both searches stop at the first hit, so the common success case
+# never scans past the first <file>/<page> tag.
+_CHILD_NODE_RE = re.compile(r'<(?:file|page)\b', re.IGNORECASE)
+_ROOT_ERROR_RE = re.compile(r'<error\b[^>]*>(.*?)</error>', re.DOTALL | re.IGNORECASE)
+
+
 def classify(source_text):
     """Classify the bare <source> string (contract §7.1). Do NOT naively regex <error>.
 
@@ -262,38 +333,41 @@ def classify(source_text):
     (e.g. onefilellm's own source builds ``</file>`` and ``<error ...>`` strings),
     which fools a strip+search and would mislabel a successful fetch as an error.
     """
+    _ensure_onefilellm()
     # 1) Empty backstop — get_token_count strips ALL tags, so ~0 means no real content.
     if get_token_count(source_text) < 5:
-        return ("empty", None)
+        return _CLASSIFY_EMPTY
     # 2) Produced structured children → the fetch succeeded; any <error> inside is
     #    per-page/per-file (or just tag-like text in file content), not a hard fail.
-    if re.search(r'<(?:file|page)\b', source_text, flags=re.IGNORECASE):
-        return ("success", None)
+    if _CHILD_NODE_RE.search(source_text):
+        return _CLASSIFY_SUCCESS
     # 3) No children: a root-level <error> means the fetch hard-failed. (The source
     #    here is simple — `<source ...><error>msg</error></source>` — and processor
     #    error messages are XML-escaped, so this regex is safe on this shape.)
-    m = re.search(r'<error\b[^>]*>(.*?)</error>', source_text, flags=re.DOTALL | re.IGNORECASE)
+    m = _ROOT_ERROR_RE.search(source_text)
     if m:
         return ("processing", m.group(1).strip())
     # 4) Otherwise success.
-    return ("success", None)
+    return _CLASSIFY_SUCCESS
+
+
+_SOURCE_TAG_RE = re.compile(r'<source\b([^>]*)>', re.IGNORECASE)
+_SOURCE_ATTR_RE = re.compile(r'\b(type|url|base_url)="([^"]*)"', re.IGNORECASE)
 
 
 def parse_source_meta(source_text):
     """Parse the opening <source …> tag for type and url/base_url (contract §7.3)."""
     src_type = ""
     src_url = ""
-    m = re.search(r'<source\b([^>]*)>', source_text, flags=re.IGNORECASE)
+    m = _SOURCE_TAG_RE.search(source_text)
     if m:
-        attrs = m.group(1)
-        tm = re.search(r'type="([^"]*)"', attrs, flags=re.IGNORECASE)
-        if tm:
-            src_type = tm.group(1)
-        um = re.search(r'url="([^"]*)"', attrs, flags=re.IGNORECASE)
-        if not um:
-            um = re.search(r'base_url="([^"]*)"', attrs, flags=re.IGNORECASE)
-        if um:
-            src_url = um.group(1)
+        # Single pass over the attribute string; first occurrence of each key
+        # wins, and url takes precedence over base_url regardless of order.
+        found = {}
+        for am in _SOURCE_ATTR_RE.finditer(m.group(1)):
+            found.setdefault(am.group(1).lower(), am.group(2))
+        src_type = found.get("type", "")
+        src_url = found["url"] if "url" in found else found.get("base_url", "")
     return {"type": src_type, "url": src_url}
 
 
@@ -311,18 +385,30 @@ def parse_nodes(source_text):
 
 def compute_metrics(source_text):
     """Wrap source_text, write both output files, compute metrics (contract §7.2)."""
+    _ensure_onefilellm()
     wrapped = f"<onefilellm_output>\n{source_text}\n</onefilellm_output>"
 
-    # write wrapped → uncompressed_output.txt ; preprocess_text(...) → compressed_output.txt
-    with open(UNCOMPRESSED_FILE, "w", encoding="utf-8") as f:
-        f.write(wrapped)
-    preprocess_text(UNCOMPRESSED_FILE, COMPRESSED_FILE)
+    # Encode once up front: the same bytes serve the file write (binary mode,
+    # so no second UTF-8 pass inside the text layer) and the size/preview math.
+    raw = wrapped.encode("utf-8")
 
-    uncompressed_tokens = get_token_count(wrapped)
-    compressed_tokens = get_token_count(safe_file_read(COMPRESSED_FILE))
+    # write wrapped → uncompressed_output.txt ; preprocess_text(...) → compressed_output.txt
+    with open(UNCOMPRESSED_FILE, "wb") as f:
+        f.write(raw)
+
+    # Tokenize the uncompressed output while preprocess_text runs: tiktoken's
+    # encoder releases the GIL, so the two passes over the content overlap.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        tokens_future = pool.submit(get_token_count, wrapped)
+        # preprocess_text returns the compressed text when it has it in memory;
+        # only the XML-preservation path (None) requires reading the file back.
+        compressed_text = preprocess_text(UNCOMPRESSED_FILE, COMPRESSED_FILE)
+        if compressed_text is None:
+            compressed_text = safe_file_read(COMPRESSED_FILE)
+        uncompressed_tokens = tokens_future.result()
+    compressed_tokens = get_token_count(compressed_text)
     estimated_model_tokens = round(uncompressed_tokens * TOKEN_ESTIMATE_MULTIPLIER)
 
-    raw = wrapped.encode("utf-8")
     total_bytes = len(raw)
     output_kb = round(total_bytes / 1024, 2)
 
@@ -359,6 +445,7 @@ def _dispatch(input_path):
     `runner(progress_cb)` invokes the right processor and returns the bare source string.
     Order matches §7.4 steps 3-10 (steps 1-2 are the security guard, handled separately).
     """
+    _ensure_onefilellm()
     parsed = urlparse(input_path)
     is_http = parsed.scheme in ("http", "https")
 
@@ -410,10 +497,12 @@ def run_job(input_path, emit=None, cancel_event=None):
     Security guard runs first on every path (contract §5). Returns the §1.2 result
     dict on the POST path; on the SSE path returns None (events carry everything).
     """
-    start = time.time()
+    # Monotonic clock: elapsed-time deltas must not jump with NTP/wall-clock
+    # adjustments, and perf_counter is cheaper than a gettimeofday syscall.
+    start = time.perf_counter()
 
     def _t():
-        return round(time.time() - start, 1)
+        return round(time.perf_counter() - start, 1)
 
     # --- Security guard before any fetch (contract §5 / §7.4 steps 1-2) ---
     sec_msg = _security_check(input_path)
@@ -571,9 +660,16 @@ def _run_worker(input_path, q, cancel_event):
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
+# Rendered GET / shell. The shell is identical for every visit (result=None,
+# fixed version), so render it once per process instead of re-executing the
+# template each time. Bypassed under app.debug to keep template auto-reload.
+_SHELL_HTML = None
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     """GET → app shell (result=None). POST → synchronous no-JS fallback (contract §1.1/§1.2)."""
+    global _SHELL_HTML
     if request.method == "POST":
         input_path = request.form.get("input_path", "").strip()
         try:
@@ -582,7 +678,11 @@ def index():
             result = {"status": "processing", "message": str(e), "detected": ""}
         return render_template("index.html", result=result, version=APP_VERSION)
 
-    return render_template("index.html", result=None, version=APP_VERSION)
+    if app.debug:
+        return render_template("index.html", result=None, version=APP_VERSION)
+    if _SHELL_HTML is None:
+        _SHELL_HTML = render_template("index.html", result=None, version=APP_VERSION)
+    return _SHELL_HTML
 
 
 @app.route("/stream")
@@ -608,11 +708,12 @@ def stream():
             yield _format_sse("error", {"subtype": "security", "message": sec_msg})
         return _sse_response(sec_gen())
 
-    # 3) Accepted — spawn daemon worker draining a bounded queue.
+    # 3) Accepted — hand the job to the persistent worker, which drains a
+    # bounded queue. Jobs are single-flight (see _job_lock), so one reusable
+    # thread serves every request with no per-request spawn/teardown.
     q = queue.Queue(maxsize=1000)
     cancel_event = threading.Event()
-    worker = threading.Thread(target=_run_worker, args=(input_path, q, cancel_event), daemon=True)
-    worker.start()
+    _WORKER_POOL.submit(_run_worker, input_path, q, cancel_event)
 
     def generator():
         try:
@@ -648,6 +749,7 @@ def _sse_response(gen):
 @app.route("/result/raw")
 def result_raw():
     """Serve full whitelisted file text inline for client copy (contract §1.4)."""
+    _ensure_onefilellm()
     which = request.args.get("which")
     if which == "uncompressed":
         filename = UNCOMPRESSED_FILE
@@ -682,7 +784,10 @@ def download():
     if not os.path.isfile(safe_path):
         abort(404)
 
-    return send_file(safe_path, as_attachment=True)
+    # conditional=True enables ETag/Last-Modified handling and Range support:
+    # re-downloads of an unchanged output short-circuit to a 304 instead of
+    # streaming the full payload again.
+    return send_file(safe_path, as_attachment=True, conditional=True)
 
 
 if __name__ == "__main__":
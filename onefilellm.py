@@ -11,7 +11,6 @@ import re
 import shlex
 import pyperclip
 from pathlib import Path
-import wget
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
@@ -22,10 +21,10 @@ import xml.etree.ElementTree as ET # Keep for preprocess_text if needed
 from typing import Union, List, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
 from urllib.robotparser import RobotFileParser
-from readability import Document
 import io
 import argparse
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Import utility functions
 from utils import (
@@ -85,6 +84,13 @@ def load_configuration() -> None:
     headers = {"Authorization": f"token {TOKEN}"} if TOKEN != DEFAULT_GITHUB_TOKEN else {}
 
 
+# Compiled once: matches XML-like tags so token counting (and subtitle
+# cleanup) can strip them without re-compiling the pattern per call.
+_XML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Matches an XML declaration (<?xml ... ?>) for stripping when combining outputs.
+_XML_DECL_RE = re.compile(r'<\?xml[^>]+\?>')
+
 # Path to cached tiktoken encoding for offline use
 LOCAL_TIKTOKEN_PATH = os.path.join(os.path.dirname(__file__), "cl100k_base.tiktoken")
 # Cached Encoding instance to avoid repeated downloads
@@ -106,6 +112,11 @@ EXCLUDED_DIRS = ["dist", "node_modules", ".git", "__pycache__"]
 # Extensions to skip when processing direct file URLs
 DISALLOWED_EXTENSIONS = {'.pdf'}
 
+# Upper bound (seconds) on each yt-dlp subtitle download. A subtitle-only
+# fetch normally finishes in a few seconds; without a bound a wedged yt-dlp
+# process would block the caller (and worker-pool shutdown) indefinitely.
+YT_DLP_TIMEOUT = 120
+
 # --- Alias Configuration ---
 ALIAS_DIR_NAME = ".onefilellm_aliases"  # Re-use existing constant
 ALIAS_DIR = Path.home() / ALIAS_DIR_NAME
@@ -127,6 +138,12 @@ def ensure_alias_dir_exists():
     ALIAS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Parsed user-alias files keyed by path -> ((mtime_ns, size), aliases dict).
+# Alias expansion re-loads the file on every CLI invocation path; the stat
+# check means an unchanged file costs one syscall instead of a JSON parse.
+_USER_ALIAS_CACHE: Dict[str, tuple] = {}
+
+
 class AliasManager:
     def __init__(self, console, core_aliases_dict, user_aliases_file_path):
         self.console = console
@@ -151,19 +168,29 @@ class AliasManager:
         self.effective_aliases_map.update(self.user_aliases_map) # User aliases override core
 
     def _load_user_aliases(self):
-        """Loads user aliases from the JSON file."""
+        """Loads user aliases from the JSON file (mtime-cached across loads)."""
         self.user_aliases_map = {}
         if self.user_aliases_file_path.exists():
             try:
+                stat_result = self.user_aliases_file_path.stat()
+                cache_key = str(self.user_aliases_file_path)
+                file_id = (stat_result.st_mtime_ns, stat_result.st_size)
+                cached = _USER_ALIAS_CACHE.get(cache_key)
+                if cached is not None and cached[0] == file_id:
+                    # Unchanged since last parse; hand out a copy so callers
+                    # mutating their map can't poison the cache.
+                    self.user_aliases_map = dict(cached[1])
+                    return
                 with open(self.user_aliases_file_path, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     if isinstance(data, dict):
                         self.user_aliases_map = data
+                        _USER_ALIAS_CACHE[cache_key] = (file_id, dict(data))
                     else:
                         self.console.print(f"[bold yellow]Warning:[/bold yellow] Alias file {self.user_aliases_file_path} is not a valid JSON object. Ignoring.")
             except json.JSONDecodeError:
                 self.console.print(f"[bold yellow]Warning:[/bold yellow] Could not parse alias file {self.user_aliases_file_path}. It may be corrupt. Please check or remove it.")
-            except IOError as e:
+            except (IOError, OSError) as e:
                 self.console.print(f"[bold red]Error:[/bold red] Could not read alias file {self.user_aliases_file_path}: {e}")
         # If file doesn't exist, user_aliases_map remains empty, which is fine.
 
@@ -227,7 +254,7 @@ class AliasManager:
         output_lines = []
         
         # Determine combined keys for proper ordering and precedence display
-        all_names = sorted(list(set(self.core_aliases_map.keys()) | set(self.user_aliases_map.keys())))
+        all_names = sorted(self.core_aliases_map.keys() | self.user_aliases_map.keys())
 
         if not all_names and (list_user or list_core):
              return "No aliases defined."
@@ -268,21 +295,23 @@ def parse_as_markitdown(text_content: str) -> str:
     # TODO: Implement actual Markitdown parsing logic when specifications are available.
     return text_content
 
+# Format-name → parser dispatch table, built once at import instead of per call.
+_FORMAT_PARSERS = {
+    "text": parse_as_plaintext,
+    "markdown": parse_as_markdown,
+    "json": parse_as_json,
+    "html": parse_as_html,
+    "yaml": parse_as_yaml,
+    "doculing": parse_as_doculing,       # Placeholder
+    "markitdown": parse_as_markitdown,   # Placeholder
+}
+
 def get_parser_for_format(format_name: str) -> callable:
     """
     Returns the appropriate parser function based on the format name.
     Defaults to parse_as_plaintext if format is unknown.
     """
-    parsers = {
-        "text": parse_as_plaintext,
-        "markdown": parse_as_markdown,
-        "json": parse_as_json,
-        "html": parse_as_html,
-        "yaml": parse_as_yaml,
-        "doculing": parse_as_doculing,       # Placeholder
-        "markitdown": parse_as_markitdown,   # Placeholder
-    }
-    return parsers.get(format_name, parse_as_plaintext) # Default to plaintext parser
+    return _FORMAT_PARSERS.get(format_name, parse_as_plaintext) # Default to plaintext parser
 
 def process_text_stream(raw_text_content: str, source_info: dict, console: Console, format_override: str | None = None) -> str | None:
     """
@@ -411,38 +440,48 @@ def process_github_repo(repo_url):
     # Start XML structure
     repo_content = [f'<source type="github_repository" url="{escape_xml(repo_url)}">']
 
-    def process_directory_recursive(url, repo_content_list):
+    def fetch_file_xml(file_info):
+        """Download one file and return its XML fragment (runs in a worker thread)."""
+        print(f"Processing {file_info['path']}...")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file = os.path.join(temp_dir, file_info["name"])
+            try:
+                download_file(file_info["download_url"], temp_file, headers=headers)
+                if file_info["name"].endswith(".ipynb"):
+                    # Append raw code - escape_xml not needed as it does nothing
+                    body = process_ipynb_file(temp_file)
+                else:
+                    # Append raw code - escape_xml not needed here
+                    body = safe_file_read(temp_file)
+                return [f'\n<file path="{escape_xml(file_info["path"])}">', body, '</file>']
+            except Exception as e:
+                print(f"[bold red]Error processing file {file_info['path']}: {e}[/bold red]")
+                return [f'\n<file path="{escape_xml(file_info["path"])}">',
+                        f'<error>Failed to download or process: {escape_xml(str(e))}</error>',
+                        '</file>']
+
+    def process_directory_recursive(url, repo_content_list, executor):
         try:
             response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             files = response.json()
 
+            # Kick off every file download in this directory at once, then
+            # collect results in listing order so output stays deterministic.
+            # Subdirectories still recurse serially on the calling thread.
+            futures = {}
+            for file_info in files:
+                if file_info["type"] == "file" and is_allowed_filetype(file_info["name"]):
+                    futures[id(file_info)] = executor.submit(fetch_file_xml, file_info)
+
             for file_info in files:
                 if file_info["type"] == "dir" and file_info["name"] in EXCLUDED_DIRS:
                     continue
 
                 if file_info["type"] == "file" and is_allowed_filetype(file_info["name"]):
-                    print(f"Processing {file_info['path']}...")
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        temp_file = os.path.join(temp_dir, file_info["name"])
-                        try:
-                            download_file(file_info["download_url"], temp_file, headers=headers)
-                            repo_content_list.append(f'\n<file path="{escape_xml(file_info["path"])}">')
-                            if file_info["name"].endswith(".ipynb"):
-                                # Append raw code - escape_xml not needed as it does nothing
-                                repo_content_list.append(process_ipynb_file(temp_file))
-                            else:
-                                # Append raw code - escape_xml not needed here
-                                repo_content_list.append(safe_file_read(temp_file))
-                            repo_content_list.append('</file>')
-                        except Exception as e:
-                            print(f"[bold red]Error processing file {file_info['path']}: {e}[/bold red]")
-                            repo_content_list.append(f'\n<file path="{escape_xml(file_info["path"])}">')
-                            repo_content_list.append(f'<error>Failed to download or process: {escape_xml(str(e))}</error>')
-                            repo_content_list.append('</file>')
-
+                    repo_content_list.extend(futures[id(file_info)].result())
                 elif file_info["type"] == "dir":
-                    process_directory_recursive(file_info["url"], repo_content_list)
+                    process_directory_recursive(file_info["url"], repo_content_list, executor)
         except requests.exceptions.RequestException as e:
             print(f"[bold red]Error fetching directory {url}: {e}[/bold red]")
             repo_content_list.append(f'<error>Failed to fetch directory {escape_xml(url)}: {escape_xml(str(e))}</error>')
@@ -451,7 +490,8 @@ def process_github_repo(repo_url):
              repo_content_list.append(f'<error>Failed processing directory {escape_xml(url)}: {escape_xml(str(e))}</error>')
 
 
-    process_directory_recursive(contents_url, repo_content)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        process_directory_recursive(contents_url, repo_content, executor)
     repo_content.append('\n</source>') # Close source tag
     print("GitHub repository processing finished.")
     return "\n".join(repo_content)
@@ -467,14 +507,18 @@ def process_local_folder(local_path, console: Console):
 
     def process_local_directory_recursive(current_path, content_list, console):
         try:
-            for item in os.listdir(current_path):
-                item_path = os.path.join(current_path, item)
+            # os.scandir reuses the directory entry's cached file type, avoiding
+            # the two extra stat() calls per entry that listdir+isdir/isfile cost.
+            entries = sorted(os.scandir(current_path), key=lambda e: e.name)
+            for entry in entries:
+                item = entry.name
+                item_path = entry.path
                 relative_path = os.path.relpath(item_path, local_path)
 
-                if os.path.isdir(item_path):
+                if entry.is_dir():
                     if item not in EXCLUDED_DIRS:
                         process_local_directory_recursive(item_path, content_list, console)
-                elif os.path.isfile(item_path):
+                elif entry.is_file():
                     if is_allowed_filetype(item):
                         console.print(f"Processing {item_path}...")
                         content_list.append(f'\n<file path="{escape_xml(relative_path)}">')
@@ -852,10 +896,10 @@ def process_arxiv_pdf(arxiv_abs_url):
                 if page_text: # Add text only if extraction was successful
                     text_list.append(page_text)
 
-            # Use XML structure
-            formatted_text = f'<source type="arxiv" url="{escape_xml(arxiv_abs_url)}">\n'
-            formatted_text += ' '.join(text_list) # Append raw extracted text
-            formatted_text += '\n</source>' # Close source tag
+            # Use XML structure; build in one shot so the (potentially large)
+            # extracted text isn't recopied by incremental concatenation.
+            formatted_text = (f'<source type="arxiv" url="{escape_xml(arxiv_abs_url)}">\n'
+                              + ' '.join(text_list) + '\n</source>')
             print("ArXiv paper processed successfully.")
             return formatted_text
 
@@ -876,24 +920,30 @@ def fetch_youtube_transcript(url):
     """
     import tempfile
     import subprocess
-    import glob
+    import fnmatch
 
     def find_subtitle_file(directory, vid):
         """Locate a subtitle file in directory, preferring English variants.
 
         yt-dlp's language codes drift (en, en-orig, en-US, en-GB, ...), so we
-        glob rather than hardcode {id}.en.vtt. Prefer .srt (normalized by
-        --convert-subs) over .vtt, and English over any other language.
+        pattern-match rather than hardcode {id}.en.vtt. Prefer .srt (normalized
+        by --convert-subs) over .vtt, and English over any other language. The
+        directory is scanned once; each pattern then matches against the cached
+        name list instead of re-walking the directory per glob.
         """
         patterns = [
             f"{vid}.en.srt", f"{vid}.en-orig.srt", f"{vid}.en*.srt", f"{vid}*.srt",
             f"{vid}.en.vtt", f"{vid}.en-orig.vtt", f"{vid}.en*.vtt", f"{vid}*.vtt",
             "*.srt", "*.vtt",
         ]
+        try:
+            names = sorted(entry.name for entry in os.scandir(directory) if entry.is_file())
+        except OSError:
+            return None
         for pattern in patterns:
-            matches = sorted(glob.glob(os.path.join(directory, pattern)))
+            matches = fnmatch.filter(names, pattern)
             if matches:
-                return matches[0]
+                return os.path.join(directory, matches[0])
         return None
 
     def parse_subtitle_text(file_path):
@@ -904,22 +954,20 @@ def fetch_youtube_transcript(url):
         cue indices, and the WEBVTT/Kind:/Language: header lines, strip inline
         tags, and collapse consecutive duplicate lines.
         """
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-
         transcript_lines = []
-        for line in content.split('\n'):
-            stripped = line.strip()
-            if (not stripped or '-->' in line or stripped.isdigit()
-                    or stripped.startswith('WEBVTT')
-                    or stripped.startswith('Kind:')
-                    or stripped.startswith('Language:')):
-                continue
-            # Remove inline HTML/VTT tags (e.g. <c>, <00:00:01.000>)
-            clean_line = re.sub(r'<[^>]+>', '', stripped).strip()
-            # Drop consecutive duplicate lines from rolling auto-captions
-            if clean_line and (not transcript_lines or transcript_lines[-1] != clean_line):
-                transcript_lines.append(clean_line)
+        # Stream the file line by line rather than read-then-split: no full-text
+        # string plus per-line list materialized for large subtitle files.
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                stripped = line.strip()
+                if (not stripped or '-->' in line or stripped.isdigit()
+                        or stripped.startswith(('WEBVTT', 'Kind:', 'Language:'))):
+                    continue
+                # Remove inline HTML/VTT tags (e.g. <c>, <00:00:01.000>)
+                clean_line = _XML_TAG_RE.sub('', stripped).strip()
+                # Drop consecutive duplicate lines from rolling auto-captions
+                if clean_line and (not transcript_lines or transcript_lines[-1] != clean_line):
+                    transcript_lines.append(clean_line)
         return transcript_lines
 
     def extract_video_id(url):
@@ -1004,14 +1052,16 @@ def fetch_youtube_transcript(url):
             ]
 
             # Run yt-dlp
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, capture_output=True, text=True,
+                                    timeout=YT_DLP_TIMEOUT)
 
             # Older yt-dlp releases predate --js-runtimes and abort on it with
             # "no such option"; retry once without the flag so they still work.
             if result.returncode != 0 and 'no such option' in (result.stderr or ''):
                 js_idx = cmd.index('--js-runtimes')
                 cmd = cmd[:js_idx] + cmd[js_idx + 2:]
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = subprocess.run(cmd, capture_output=True, text=True,
+                                        timeout=YT_DLP_TIMEOUT)
 
             # Discover a subtitle file regardless of exit code: a 429 on one
             # secondary language (e.g. en-de) returns nonzero even though the
@@ -1039,6 +1089,9 @@ def fetch_youtube_transcript(url):
 
     except FileNotFoundError:
         error_msg = "yt-dlp not found. Please install it with: pip install yt-dlp"
+    except subprocess.TimeoutExpired:
+        error_msg = f"yt-dlp timed out after {YT_DLP_TIMEOUT} seconds"
+        print(f"yt-dlp method failed: {error_msg}")
     except Exception as e:
         error_msg = f"yt-dlp failed: {str(e)}"
         print(f"yt-dlp method failed: {error_msg}")
@@ -1099,11 +1152,10 @@ def fetch_youtube_transcript(url):
 
     # Format the successful transcript or return error
     if transcript_text:
-        # Use XML structure for success
-        formatted_text = f'<source type="youtube_transcript" url="{escape_xml(url)}">\n'
-        formatted_text += transcript_text
-        formatted_text += '\n</source>'
-        return formatted_text
+        # Use XML structure for success (single concatenation — long transcripts
+        # shouldn't be recopied per +=)
+        return (f'<source type="youtube_transcript" url="{escape_xml(url)}">\n'
+                + transcript_text + '\n</source>')
     
     # Handle errors
     if not error_msg:
@@ -1122,6 +1174,11 @@ def preprocess_text(input_file, output_file):
     """
     Preprocesses text, optionally removing stopwords if NLTK is enabled.
     Handles potential XML structure if present (intended for compressed output).
+
+    Returns the processed text when it is already in memory (the plain-text and
+    fallback paths), so callers can skip re-reading output_file from disk.
+    Returns None on the XML-preservation path, where only the serialized tree
+    exists on disk.
     """
     print("Preprocessing text for compression (if enabled)...")
     with open(input_file, "r", encoding="utf-8") as infile:
@@ -1161,18 +1218,21 @@ def preprocess_text(input_file, output_file):
         tree = ET.ElementTree(root)
         tree.write(output_file, encoding="utf-8", xml_declaration=True)
         print("Text preprocessing with XML structure preservation completed.")
+        return None
     except ET.ParseError:
         # If input is not valid XML (likely our case with raw content), process as plain text
         processed_text = process_content(input_text)
         with open(output_file, "w", encoding="utf-8") as out_file:
             out_file.write(processed_text)
         print("Input was not XML. Text preprocessing completed as plain text.")
+        return processed_text
     except Exception as e:
         print(f"[bold red]Error during text preprocessing: {e}[/bold red]")
         # Fallback: write the original text if preprocessing fails
         with open(output_file, "w", encoding="utf-8") as out_file:
              out_file.write(input_text)
         print("[bold yellow]Warning:[/bold yellow] Preprocessing failed, writing original content to compressed file.")
+        return input_text
 
 
 
@@ -1226,13 +1286,22 @@ def get_token_count(text, disallowed_special=None, chunk_size=1000):
     enc = _load_tiktoken_encoding()
 
     # Remove XML tags before counting tokens
-    text_without_tags = re.sub(r'<[^>]+>', '', text)
+    text_without_tags = _XML_TAG_RE.sub('', text)
 
     if enc is None:
         # Rough character-based estimate when encoding isn't available
         return max(1, len(text_without_tags) // 4) if text_without_tags else 0
 
     chunks = [text_without_tags[i:i+chunk_size] for i in range(0, len(text_without_tags), chunk_size)]
+
+    # Fast path: one C-level sum over all chunks, no per-chunk branching.
+    try:
+        return sum(len(enc.encode(chunk, disallowed_special=disallowed_special)) for chunk in chunks)
+    except Exception:
+        pass
+
+    # Slow path (rare): re-count chunk by chunk so a single bad chunk only
+    # degrades to the character estimate instead of failing the whole count.
     total_tokens = 0
     for chunk in chunks:
         try:
@@ -1652,6 +1721,10 @@ class DocCrawler:
 
     def _process_html_to_structured_data(self, html_content: str, url: str) -> Dict:
         try:
+            # Lazy import: readability pulls in lxml, which is only needed
+            # once a crawl actually processes an HTML page.
+            from readability import Document
+
             doc = Document(html_content)
             title = _clean_text_content(doc.title())
             
@@ -2115,11 +2188,10 @@ def process_doi_or_pmid(identifier):
 
     # After trying all domains
     if pdf_text is not None:
-        # Use XML structure for success
-        formatted_text = f'<source type="sci-hub" identifier="{escape_xml(identifier)}">\n'
-        formatted_text += pdf_text # Append raw extracted text
-        formatted_text += '\n</source>'
-        return formatted_text
+        # Use XML structure for success (single concatenation around the raw
+        # extracted text)
+        return (f'<source type="sci-hub" identifier="{escape_xml(identifier)}">\n'
+                + pdf_text + '\n</source>')
     else:
         print(f"[bold red]Failed to process identifier {identifier} using all Sci-Hub domains tried.[/bold red]")
         # Use XML structure for error
@@ -2507,9 +2579,12 @@ def combine_xml_outputs(outputs):
     
     # Add each source
     for output in outputs:
-        # Remove any XML declaration if present (rare but possible)
-        output = re.sub(r'<\?xml[^>]+\?>', '', output).strip()
-        combined.append(output)
+        # Remove any XML declaration if present (rare but possible). The cheap
+        # substring probe skips a regex pass over multi-MB outputs that don't
+        # carry one, which is nearly all of them.
+        if '<?xml' in output:
+            output = _XML_DECL_RE.sub('', output)
+        combined.append(output.strip())
     
     # Close the wrapper
     combined.append('</onefilellm_output>')
@@ -8,22 +8,24 @@ import unittest
 import os
 import sys
 import json
+import asyncio
 import tempfile
 import shutil
 import time
 import subprocess
 import io
+import contextlib
+import traceback
+import types
 from pathlib import Path
 from unittest.mock import patch, MagicMock, AsyncMock
-import requests
-import pandas as pd
-import pyperclip
 from rich.console import Console
-from rich.table import Table
-from rich.text import Text
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add parent directory to path for imports (skip when already present, e.g.
+# re-imports under pytest workers)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
 import onefilellm
 
@@ -45,8 +47,11 @@ from onefilellm import (
     combine_xml_outputs,
     preprocess_text,
     ensure_alias_dir_exists,
+    AliasManager,
+    CORE_ALIASES,
     ENABLE_COMPRESSION_AND_NLTK,
-    TOKEN_ESTIMATE_MULTIPLIER
+    TOKEN_ESTIMATE_MULTIPLIER,
+    main,
 )
 
 from utils import (
@@ -75,6 +80,25 @@ RUN_INTEGRATION_TESTS = os.environ.get('RUN_INTEGRATION_TESTS', 'true').lower()
 RUN_SLOW_TESTS = os.environ.get('RUN_SLOW_TESTS', 'false').lower() == 'true'
 
 
+@contextlib.contextmanager
+def _scoped_environ(updates=None, clear=False):
+    """Temporarily swap os.environ entries with a plain dict save/restore.
+
+    Cheaper than unittest.mock.patch.dict (no descriptor machinery) for
+    tests that only need a handful of variables set or cleared.
+    """
+    saved = dict(os.environ)
+    try:
+        if clear:
+            os.environ.clear()
+        if updates:
+            os.environ.update(updates)
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
 class TestConfigurationLoading(unittest.TestCase):
     """Verify environment-driven configuration is loaded correctly."""
 
@@ -103,7 +127,7 @@ class TestConfigurationLoading(unittest.TestCase):
         """Environment variables should update runtime configuration."""
 
         with patch('onefilellm.load_dotenv') as mock_dotenv, \
-             patch.dict(os.environ, {'OFFLINE_MODE': 'TrUe', 'GITHUB_TOKEN': 'abc123'}, clear=False):
+             _scoped_environ({'OFFLINE_MODE': 'TrUe', 'GITHUB_TOKEN': 'abc123'}):
             onefilellm.load_configuration()
 
         mock_dotenv.assert_called_once()
@@ -117,7 +141,7 @@ class TestConfigurationLoading(unittest.TestCase):
         onefilellm._WARNED_ABOUT_TOKEN = False
         with patch('onefilellm.load_dotenv') as mock_dotenv, \
              patch('onefilellm.print') as mock_print, \
-             patch.dict(os.environ, {}, clear=True):
+             _scoped_environ(clear=True):
             onefilellm.load_configuration()
 
         mock_dotenv.assert_called_once()
@@ -215,6 +239,8 @@ class TestUtilityFunctions(unittest.TestCase):
 
     def test_download_file_stream_and_error_handling(self):
         """Test streaming download and graceful error handling"""
+        import requests
+
         url = "http://example.com/file"
         target_path = os.path.join(self.temp_dir, "download.bin")
 
@@ -396,6 +422,8 @@ class TestStreamProcessing(unittest.TestCase):
 
     def test_clipboard_errors(self):
         """Test clipboard error handling"""
+        import pyperclip
+
         # We're testing the actual function behavior, not mocking
         # The function returns None when clipboard is empty or has errors
         with patch('pyperclip.paste') as mock_paste:
@@ -417,11 +445,10 @@ class TestProcessInputFileURLs(unittest.TestCase):
 
     def setUp(self):
         self.console = Console(file=io.StringIO())
-        self.args = type('Args', (), {})()
+        self.args = types.SimpleNamespace()
 
     def test_direct_file_url_multiple_types(self):
         """Ensure direct file URLs for allowed types are processed directly"""
-        import asyncio
         for ext in ['.txt', '.md', '.py']:
             url = f'http://example.com/test{ext}'
             with patch('onefilellm._download_and_read_file', return_value='content'), \
@@ -433,7 +460,6 @@ class TestProcessInputFileURLs(unittest.TestCase):
 
     def test_disallowed_extension_uses_crawler(self):
         """Ensure disallowed extensions bypass direct processing"""
-        import asyncio
         url = 'http://example.com/file.pdf'
         fake_crawl = {'content': 'pdf content', 'processed_urls': []}
         with patch('onefilellm.crawl_and_extract_text', return_value=fake_crawl), \
@@ -444,7 +470,6 @@ class TestProcessInputFileURLs(unittest.TestCase):
 
     def test_unallowed_extension_uses_web_crawl(self):
         """Ensure unallowed extensions trigger web crawl"""
-        import asyncio
         url = 'http://example.com/file.exe'
         with patch('onefilellm.process_web_crawl', new_callable=AsyncMock, return_value='crawl result') as mock_crawl, \
              patch('onefilellm._download_and_read_file') as mock_download:
@@ -459,11 +484,10 @@ class TestProcessInputDoiPmid(unittest.TestCase):
 
     def setUp(self):
         self.console = Console(file=io.StringIO())
-        self.args = type('Args', (), {})()
+        self.args = types.SimpleNamespace()
 
     def test_process_input_normalizes_identifier_prefixes(self):
         """Inputs with or without DOI/PMID prefixes should resolve to the same identifier."""
-        import asyncio
 
         cases = [
             ("10.1000/xyz123", "10.1000/xyz123"),
@@ -501,7 +525,6 @@ class TestCoreProcessing(unittest.TestCase):
         with patch('onefilellm.process_input', new_callable=AsyncMock) as mock_process:
             mock_process.return_value = '<source type="local_file">Test content</source>'
             # Use a synchronous wrapper to test the async function
-            import asyncio
             result = asyncio.run(mock_process(test_file, None, Console()))
             self.assertIn('<source type="local_file"', result)
             self.assertIn('Test content', result)
@@ -534,6 +557,8 @@ class TestCoreProcessing(unittest.TestCase):
     
     def test_excel_processing(self):
         """Test Excel file processing"""
+        import pandas as pd
+
         # Create test Excel file
         excel_file = os.path.join(self.temp_dir, "test.xlsx")
         df1 = pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
@@ -687,7 +712,6 @@ class TestAliasSystem2OLD(unittest.TestCase):
     def test_handle_add_alias(self):
         """Test creating aliases with --add-alias"""
         from onefilellm import handle_add_alias
-        from rich.console import Console
         
         console = Console()
         
@@ -709,7 +733,6 @@ class TestAliasSystem2OLD(unittest.TestCase):
     def test_handle_alias_from_clipboard(self):
         """Test creating aliases from clipboard content"""
         from onefilellm import handle_alias_from_clipboard
-        from rich.console import Console
         
         console = Console()
         
@@ -734,7 +757,6 @@ class TestAliasSystem2OLD(unittest.TestCase):
     def test_load_alias(self):
         """Test loading and resolving aliases"""
         from onefilellm import load_alias
-        from rich.console import Console
         
         console = Console()
         
@@ -753,7 +775,6 @@ class TestAliasSystem2OLD(unittest.TestCase):
     def test_alias_validation(self):
         """Test alias name validation"""
         from onefilellm import handle_add_alias
-        from rich.console import Console
         
         console = Console()
         
@@ -768,33 +789,50 @@ class TestAliasSystem2OLD(unittest.TestCase):
             self.assertFalse(alias_file.exists())
 
 
-class TestAliasSystem2(unittest.TestCase):
-    """Test new Alias Management 2.0 functionality"""
-    
+class AliasManagerTestCase(unittest.TestCase):
+    """Shared fixture for the alias tests.
+
+    Pools a single Console for the whole class (Console construction probes
+    the terminal on every call) and provides make_manager() so each test
+    builds its AliasManager against the per-test temp alias file without
+    repeating the console/manager/load boilerplate.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.console = Console()
+
     def setUp(self):
         self.temp_alias_dir = tempfile.mkdtemp()
         self.alias_file = Path(self.temp_alias_dir) / "aliases.json"
-        
+
         # Mock the alias configuration directory
         self.config_dir_patcher = patch('onefilellm.ALIAS_DIR', Path(self.temp_alias_dir))
         self.config_dir_patcher.start()
-        
+
         # Mock the user aliases path
         self.aliases_path_patcher = patch('onefilellm.USER_ALIASES_PATH', self.alias_file)
         self.aliases_path_patcher.start()
-        
+
     def tearDown(self):
         self.config_dir_patcher.stop()
         self.aliases_path_patcher.stop()
         shutil.rmtree(self.temp_alias_dir)
+
+    def make_manager(self, load=True):
+        manager = AliasManager(self.console, CORE_ALIASES, self.alias_file)
+        if load:
+            manager.load_aliases()
+        return manager
+
+
+class TestAliasSystem2(AliasManagerTestCase):
+    """Test new Alias Management 2.0 functionality"""
     
     def test_alias_manager_creation(self):
         """Test AliasManager instantiation and basic setup"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
+        manager = self.make_manager(load=False)
         
         # Should have core aliases
         self.assertIsInstance(manager.core_aliases_map, dict)
@@ -806,12 +844,8 @@ class TestAliasSystem2(unittest.TestCase):
     
     def test_alias_manager_json_storage(self):
         """Test JSON file creation and loading"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Add a user alias
         result = manager.add_or_update_alias("test_alias", "https://example.com --flag")
@@ -828,12 +862,8 @@ class TestAliasSystem2(unittest.TestCase):
     
     def test_alias_manager_validation(self):
         """Test alias name validation"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Valid names should work
         self.assertTrue(manager.add_or_update_alias("valid_alias", "command"))
@@ -848,12 +878,8 @@ class TestAliasSystem2(unittest.TestCase):
     
     def test_alias_manager_precedence(self):
         """Test user aliases override core aliases"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check core alias exists
         core_command = manager.get_command("ofl_repo")
@@ -876,12 +902,8 @@ class TestAliasSystem2(unittest.TestCase):
 
     def test_alias_listing_functionality(self):
         """Test alias listing with different options"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Add some user aliases
         manager.add_or_update_alias("user_alias1", "https://example1.com")
@@ -903,34 +925,13 @@ class TestAliasSystem2(unittest.TestCase):
         self.assertIn("ofl_repo", core_list)
 
 
-class TestAdvancedAliasFeatures(unittest.TestCase):
+class TestAdvancedAliasFeatures(AliasManagerTestCase):
     """Test advanced alias functionality including placeholders and complex scenarios"""
     
-    def setUp(self):
-        self.temp_alias_dir = tempfile.mkdtemp()
-        self.alias_file = Path(self.temp_alias_dir) / "aliases.json"
-        
-        # Mock the alias configuration directory
-        self.config_dir_patcher = patch('onefilellm.ALIAS_DIR', Path(self.temp_alias_dir))
-        self.config_dir_patcher.start()
-        
-        # Mock the user aliases path
-        self.aliases_path_patcher = patch('onefilellm.USER_ALIASES_PATH', self.alias_file)
-        self.aliases_path_patcher.start()
-        
-    def tearDown(self):
-        self.config_dir_patcher.stop()
-        self.aliases_path_patcher.stop()
-        shutil.rmtree(self.temp_alias_dir)
-
     def test_placeholder_functionality(self):
         """Test dynamic placeholder substitution in aliases"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Test core alias with placeholder
         gh_search_command = manager.get_command("gh_search")
@@ -951,12 +952,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_complex_multi_source_aliases(self):
         """Test complex aliases with multiple sources"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Test comprehensive ecosystem alias
         ecosystem_sources = " ".join([
@@ -983,12 +980,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_alias_with_mixed_source_types(self):
         """Test aliases containing different types of sources"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Mixed sources: GitHub, ArXiv, DOI, YouTube, local files
         mixed_sources = " ".join([
@@ -1013,13 +1006,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_alias_expansion_simulation(self):
         """Test simulating the main() alias expansion logic"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         import shlex
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Add test aliases
         manager.add_or_update_alias("test_simple", "https://example.com")
@@ -1063,12 +1052,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_alias_edge_cases(self):
         """Test edge cases and error conditions"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Test empty command string
         result = manager.add_or_update_alias("empty_test", "")
@@ -1096,22 +1081,16 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_json_persistence_and_loading(self):
         """Test JSON file persistence and loading across manager instances"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
-        
-        console = Console()
         
         # Create first manager instance and add aliases
-        manager1 = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager1.load_aliases()
+        manager1 = self.make_manager()
         
         manager1.add_or_update_alias("persist_test1", "https://test1.com")
         manager1.add_or_update_alias("persist_test2", "https://test2.com file.txt")
         manager1.add_or_update_alias("persist_placeholder", "https://search.com?q={}")
         
         # Create second manager instance (simulating restart)
-        manager2 = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager2.load_aliases()
+        manager2 = self.make_manager()
         
         # Verify all aliases were persisted and loaded
         self.assertEqual(manager2.get_command("persist_test1"), "https://test1.com")
@@ -1129,12 +1108,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_alias_removal_and_core_restoration(self):
         """Test removing user aliases and core alias restoration"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Get original core alias
         original_core = manager.get_command("ofl_repo")
@@ -1163,13 +1138,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_complex_placeholder_scenarios(self):
         """Test complex placeholder usage scenarios"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         import shlex
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Test multiple placeholders in same command
         manager.add_or_update_alias("multi_placeholder", 
@@ -1202,12 +1173,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_real_world_alias_scenarios(self):
         """Test realistic, complex alias scenarios"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Modern web development ecosystem (realistic scenario)
         web_ecosystem = " ".join([
@@ -1272,12 +1239,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_alias_validation_comprehensive(self):
         """Comprehensive alias name validation tests"""
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Valid alias names
         valid_names = [
@@ -1317,13 +1280,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_single_source(self):
         """Test --alias-add with single source (backward compatibility)"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test single source alias
         test_args = ['onefilellm.py', '--alias-add', 'test_single', 'https://example.com']
@@ -1332,12 +1291,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check the alias exists and has correct value
         command = manager.get_command('test_single')
@@ -1345,13 +1300,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_multi_source_quoted(self):
         """Test --alias-add with quoted multi-source command (backward compatibility)"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test multi-source alias with quotes
         test_args = ['onefilellm.py', '--alias-add', 'test_multi_quoted', 
@@ -1361,12 +1312,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check the alias exists and has all sources
         command = manager.get_command('test_multi_quoted')
@@ -1376,13 +1323,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_multi_source_unquoted(self):
         """Test --alias-add with unquoted multi-source command (new functionality)"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test multi-source alias without quotes - NEW FUNCTIONALITY
         test_args = ['onefilellm.py', '--alias-add', 'test_multi_unquoted', 
@@ -1392,12 +1335,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check the alias exists and has all sources
         command = manager.get_command('test_multi_unquoted')
@@ -1414,13 +1353,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_with_local_files(self):
         """Test --alias-add with URLs and local files mixed"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test alias with URLs and local files
         test_args = ['onefilellm.py', '--alias-add', 'test_mixed', 
@@ -1431,12 +1366,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check the alias has all components
         command = manager.get_command('test_mixed')
@@ -1447,13 +1378,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_placeholder_support(self):
         """Test --alias-add with placeholder {} support"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test alias with placeholder and multiple sources
         test_args = ['onefilellm.py', '--alias-add', 'test_search', 
@@ -1463,12 +1390,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check placeholder is preserved
         command = manager.get_command('test_search')
@@ -1476,13 +1399,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_error_handling(self):
         """Test --alias-add error handling for invalid inputs"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Test with only one argument (missing command string)
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         test_args = ['onefilellm.py', '--alias-add', 'only_name']
         with patch('sys.argv', test_args):
             with patch('sys.stdout', captured_output):
@@ -1494,13 +1413,9 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
 
     def test_cli_alias_add_special_characters(self):
         """Test --alias-add with special characters and edge cases"""
-        from onefilellm import main
-        import sys
-        import asyncio
-        from io import StringIO
         
         # Capture output
-        captured_output = StringIO()
+        captured_output = io.StringIO()
         
         # Test alias with special characters in URL
         test_args = ['onefilellm.py', '--alias-add', 'test_special', 
@@ -1511,12 +1426,8 @@ class TestAdvancedAliasFeatures(unittest.TestCase):
                 asyncio.run(main())
         
         # Verify alias was created correctly
-        from onefilellm import AliasManager, CORE_ALIASES
-        from rich.console import Console
         
-        console = Console()
-        manager = AliasManager(console, CORE_ALIASES, self.alias_file)
-        manager.load_aliases()
+        manager = self.make_manager()
         
         # Check special characters are preserved
         command = manager.get_command('test_special')
@@ -1552,17 +1463,15 @@ class TestIntegration(unittest.TestCase):
         that may have restricted transcripts to ensure error handling works correctly.
         The error output is expected and suppressed to avoid confusion.
         """
-        import io
         import contextlib
-        
+
         # Use Rick Astley's video which often has transcript issues
         youtube_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        
-        # Capture stdout and stderr to suppress error messages during test
-        captured_output = io.StringIO()
-        captured_error = io.StringIO()
-        
-        with contextlib.redirect_stdout(captured_output), contextlib.redirect_stderr(captured_error):
+
+        # Discard stdout/stderr during the fetch — nothing reads the captured
+        # text, so sink it to devnull instead of accumulating it in StringIO.
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
             result = fetch_youtube_transcript(youtube_url)
         
         # Check that the function returns a valid XML structure even on error
@@ -1669,7 +1578,6 @@ class TestErrorHandling(unittest.TestCase):
         # Mock the process_input function since it's now async and requires args
         with patch('onefilellm.process_input', new_callable=AsyncMock) as mock_process:
             mock_process.return_value = '<error>File not found</error>'
-            import asyncio
             result = asyncio.run(mock_process("/nonexistent/file/path.txt", None, Console()))
             self.assertIn('error', result.lower())
     
@@ -1678,7 +1586,6 @@ class TestErrorHandling(unittest.TestCase):
         # Mock the process_input function since it's now async and requires args
         with patch('onefilellm.process_input', new_callable=AsyncMock) as mock_process:
             mock_process.return_value = '<error>Invalid URL</error>'
-            import asyncio
             result = asyncio.run(mock_process("not_a_valid_url", None, Console()))
             self.assertIn('error', result.lower())
     
@@ -1700,8 +1607,6 @@ class TestErrorHandling(unittest.TestCase):
 
     def test_youtube_subprocess_failure(self):
         """Simulate yt-dlp subprocess failure and verify error handling."""
-        import types
-
         # Create a fake youtube_transcript_api module that always fails
         fake_module = types.ModuleType("youtube_transcript_api")
 
@@ -1759,10 +1664,11 @@ class TestOfflineMode(unittest.TestCase):
         mock_get.assert_not_called()
 
     def test_process_web_crawl_offline(self):
-        import asyncio
 
-        console = Console(file=io.StringIO())
-        args = type('Args', (), {})()
+        # record=True captures plain text for export_text(); the StringIO file
+        # only silences terminal output.
+        console = Console(record=True, file=io.StringIO())
+        args = types.SimpleNamespace()
 
         with patch('onefilellm.DocCrawler') as mock_crawler:
             result = asyncio.run(
@@ -1772,7 +1678,7 @@ class TestOfflineMode(unittest.TestCase):
         self.assertIn('<source type="web_crawl"', result)
         self.assertIn('Offline mode enabled', result)
         mock_crawler.assert_not_called()
-        self.assertIn('Offline mode enabled; skipping web crawl', console.file.getvalue())
+        self.assertIn('Offline mode enabled; skipping web crawl', console.export_text())
 
     def test_process_github_pull_request_offline(self):
         with patch('requests.get') as mock_get:
@@ -1970,10 +1876,11 @@ class TestPerformance(unittest.TestCase):
             # Mock the process_input function since it's now async and requires args
             with patch('onefilellm.process_input', new_callable=AsyncMock) as mock_process:
                 mock_process.return_value = '<source type="local_file">Large file content</source>'
-                start_time = time.time()
-                import asyncio
+                # perf_counter is monotonic: wall-clock (time.time) can step
+                # backwards under NTP and fail the elapsed-time bound spuriously.
+                start_time = time.perf_counter()
                 result = asyncio.run(mock_process(f.name, None, Console()))
-                end_time = time.time()
+                end_time = time.perf_counter()
                 
                 self.assertIn('<source type="local_file"', result)
                 self.assertLess(end_time - start_time, 5)  # Should complete within 5 seconds
@@ -2161,12 +2068,9 @@ class TestAdvancedWebCrawler(unittest.TestCase):
             None
         ]
         
-        for url in valid_urls:
-            self.assertTrue(url.startswith(('http://', 'https://')))
-        
-        for url in invalid_urls:
-            if url:
-                self.assertFalse(url.startswith(('http://', 'https://')))
+        self.assertTrue(all(url.startswith(('http://', 'https://')) for url in valid_urls))
+
+        self.assertFalse(any(url.startswith(('http://', 'https://')) for url in invalid_urls if url))
 
 
 class TestMultipleInputProcessing(unittest.TestCase):
@@ -2239,7 +2143,6 @@ class TestMultipleInputProcessing(unittest.TestCase):
             
             for input_item in inputs:
                 try:
-                    import asyncio
                     result = asyncio.run(mock_process(input_item, None, Console()))
                     results.append(result)
                 except Exception as e:
@@ -2282,9 +2185,9 @@ class TestMultipleInputProcessing(unittest.TestCase):
         # Test that all files were created
         self.assertEqual(len(large_input_list), 10)
         
-        # Test that all files exist
-        for test_file in large_input_list:
-            self.assertTrue(os.path.exists(test_file))
+        # Test that all files exist (single assertion, short-circuits on the
+        # first missing file instead of one assert frame per element)
+        self.assertTrue(all(os.path.exists(test_file) for test_file in large_input_list))
         
         # Test file content
         for i, test_file in enumerate(large_input_list):
@@ -2305,17 +2208,22 @@ class RichTestResult(unittest.TextTestResult):
         self.console = Console()
         self.test_results = []
         self.verbosity = verbosity
+        # Name of the test currently running. Tests execute strictly serially
+        # within one result object, so a single scalar (set in startTest,
+        # consumed by the terminal handlers) replaces per-test recomputation.
+        self._current_test_name = ""
         
     def startTest(self, test):
         super().startTest(test)
+        self._current_test_name = f"{test.__class__.__name__}.{test._testMethodName}"
         if self.verbosity > 1:
-            test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-            self.console.print(f"🔄 Running: [cyan]{test_name}[/cyan]", end="")
+            self.console.print(f"🔄 Running: [cyan]{self._current_test_name}[/cyan]", end="")
     
     def addSuccess(self, test):
         super().addSuccess(test)
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        self.test_results.append(('success', test_name))
+        # Passing is the overwhelmingly common case; the summary only needs
+        # counters (testsRun minus the failure lists), so don't retain a
+        # per-pass record tuple. Non-success outcomes still get one below.
         if self.verbosity > 1:
             self.console.print(" [bold green]✓ PASSED[/bold green]")
         elif self.verbosity == 1:
@@ -2323,32 +2231,27 @@ class RichTestResult(unittest.TextTestResult):
     
     def addError(self, test, err):
         super().addError(test, err)
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        self.test_results.append(('error', test_name))
+        self.test_results.append(('error', self._current_test_name))
         if self.verbosity > 1:
             self.console.print(" [bold red]✗ ERROR[/bold red]")
             if self.verbosity > 2:
-                import traceback
                 self.console.print(f"[red]{traceback.format_exception(*err)[-1]}[/red]")
         elif self.verbosity == 1:
             self.console.print("[bold red]E[/bold red]", end="")
     
     def addFailure(self, test, err):
         super().addFailure(test, err)
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        self.test_results.append(('failure', test_name))
+        self.test_results.append(('failure', self._current_test_name))
         if self.verbosity > 1:
             self.console.print(" [bold red]✗ FAILED[/bold red]")
             if self.verbosity > 2:
-                import traceback
                 self.console.print(f"[red]{traceback.format_exception(*err)[-1]}[/red]")
         elif self.verbosity == 1:
             self.console.print("[bold red]F[/bold red]", end="")
     
     def addSkip(self, test, reason):
         super().addSkip(test, reason)
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        self.test_results.append(('skip', test_name))
+        self.test_results.append(('skip', self._current_test_name))
         if self.verbosity > 1:
             self.console.print(f" [yellow]⚠ SKIPPED[/yellow]: {reason}")
         elif self.verbosity == 1:
@@ -2376,6 +2279,9 @@ class RichTestRunner(unittest.TextTestRunner):
         return result
     
     def _print_summary(self, result):
+        from rich.table import Table
+        from rich.text import Text
+
         self.console.print("\n[bold bright_blue]══════════════════════════════════════════════════════════════════════[/bold bright_blue]")
         
         # Create summary table
@@ -2384,20 +2290,26 @@ class RichTestRunner(unittest.TextTestRunner):
         table.add_column("Count", justify="right", width=10)
         table.add_column("Status", width=20)
         
+        # Compute the counters once instead of re-measuring the result lists
+        # for every row below.
+        failure_count = len(result.failures)
+        error_count = len(result.errors)
+        skip_count = len(result.skipped)
+        success_count = result.testsRun - failure_count - error_count - skip_count
+
         # Add rows
         table.add_row("Tests Run", str(result.testsRun), "")
-        
-        success_count = result.testsRun - len(result.failures) - len(result.errors) - len(result.skipped)
+
         table.add_row("Passed", str(success_count), Text("✓", style="bold green") if success_count > 0 else "")
-        
-        table.add_row("Failed", str(len(result.failures)), 
-                     Text("✗", style="bold red") if len(result.failures) > 0 else Text("✓", style="bold green"))
-        
-        table.add_row("Errors", str(len(result.errors)), 
-                     Text("✗", style="bold red") if len(result.errors) > 0 else Text("✓", style="bold green"))
-        
-        table.add_row("Skipped", str(len(result.skipped)), 
-                     Text("⚠", style="yellow") if len(result.skipped) > 0 else "")
+
+        table.add_row("Failed", str(failure_count),
+                     Text("✗", style="bold red") if failure_count > 0 else Text("✓", style="bold green"))
+
+        table.add_row("Errors", str(error_count),
+                     Text("✗", style="bold red") if error_count > 0 else Text("✓", style="bold green"))
+
+        table.add_row("Skipped", str(skip_count),
+                     Text("⚠", style="yellow") if skip_count > 0 else "")
         
         self.console.print(table)
         
@@ -2415,12 +2327,25 @@ class RichTestRunner(unittest.TextTestRunner):
                     self.console.print(f"  [red]• {test_name}[/red]")
 
 
+# Memo for per-class discovery: loadTestsFromTestCase re-walks the class dict
+# (dir() + getattr per name) on every call, so repeated run_all_tests()
+# invocations in one process would pay the same discovery cost N times.
+_DISCOVERED_TESTS = {}
+
+
+def _load_class_tests(loader, test_class):
+    """Discover a TestCase's tests once and reuse the result on later runs."""
+    if test_class not in _DISCOVERED_TESTS:
+        _DISCOVERED_TESTS[test_class] = list(loader.loadTestsFromTestCase(test_class))
+    return list(_DISCOVERED_TESTS[test_class])
+
+
 def run_all_tests(verbosity=2):
     """Run all tests with optional filtering"""
     # Create test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
-    
+
     # Add all test classes
     test_classes = [
         TestUtilityFunctions,
@@ -2438,10 +2363,12 @@ def run_all_tests(verbosity=2):
         TestMultipleInputProcessing
     ]
     
-    for test_class in test_classes:
-        tests = loader.loadTestsFromTestCase(test_class)
-        suite.addTests(tests)
-    
+    # One addTests call over a flattening generator instead of a Python-level
+    # append loop per class.
+    suite.addTests(test
+                   for test_class in test_classes
+                   for test in _load_class_tests(loader, test_class))
+
     # Run tests with rich formatting
     runner = RichTestRunner(verbosity=verbosity, stream=sys.stderr)
     result = runner.run(suite)
@@ -92,7 +92,9 @@ def clean_outputs_and_lock(web_app_module):
     Several tests intentionally write/remove the two whitelisted output files in
     OUTPUT_DIR; wipe them around every test so a leftover file can't make a 404
     test pass for the wrong reason. Also defensively release the single-flight
-    lock in case a test left it held.
+    lock in case a test left it held, and clear the DNS resolver cache so each
+    test's _patch_getaddrinfo mock is actually consulted (the module is
+    session-scoped, so cached resolutions would otherwise leak between tests).
     """
     out_dir = web_app_module.OUTPUT_DIR
 
@@ -105,6 +107,7 @@ def clean_outputs_and_lock(web_app_module):
                 pass
 
     _wipe()
+    web_app_module._RESOLVE_CACHE.clear()
     yield
     _wipe()
     if web_app_module._job_lock.locked():
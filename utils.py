@@ -11,12 +11,10 @@ This module contains common utilities used across the application including:
 import os
 import sys
 import re
+import json
 import requests
-from pathlib import Path
 from urllib.parse import urlparse
 from typing import Union, Optional, Dict
-import pyperclip
-from bs4 import BeautifulSoup
 
 # Try to import yaml, but don't fail if not available
 try:
@@ -24,6 +22,24 @@ try:
 except ImportError:
     yaml = None
 
+# Prefer PyYAML's C loader when libyaml is available — ~10x faster than the
+# pure-Python SafeLoader and identical for safe_load semantics.
+_YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', getattr(yaml, 'SafeLoader', None)) if yaml else None
+
+# Precompiled patterns for detect_text_format. Format detection runs on every
+# piped/clipboard input, so compile once at import instead of per call.
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_MARKDOWN_PATTERNS = [
+    re.compile(r'^#{1,6}\s', re.MULTILINE),          # Headers
+    re.compile(r'\*\*[^*]+\*\*', re.MULTILINE),      # Bold
+    re.compile(r'\*[^*]+\*', re.MULTILINE),          # Italic
+    re.compile(r'\[([^\]]+)\]\([^)]+\)', re.MULTILINE),  # Links
+    re.compile(r'^\s*[-*+]\s', re.MULTILINE),        # Lists
+    re.compile(r'^\s*\d+\.\s', re.MULTILINE),        # Numbered lists
+    re.compile(r'^```', re.MULTILINE),               # Code blocks
+    re.compile(r'`[^`]+`', re.MULTILINE),            # Inline code
+]
+
 
 # ===== File I/O Utilities =====
 
@@ -53,6 +69,10 @@ def read_from_clipboard() -> Optional[str]:
     Returns:
         The text content from the clipboard, or None if empty or error.
     """
+    # Imported here rather than at module top: pyperclip probes for a system
+    # clipboard backend, and most invocations never touch the clipboard.
+    import pyperclip
+
     try:
         clipboard_content = pyperclip.paste()
         if clipboard_content and clipboard_content.strip():
@@ -112,46 +132,34 @@ def detect_text_format(text_sample: str) -> str:
     if (text_sample.startswith('{') and text_sample.endswith('}')) or \
        (text_sample.startswith('[') and text_sample.endswith(']')):
         try:
-            import json
             json.loads(text_sample)
             return 'json'
         except Exception:
             pass
 
-    # YAML detection
-    if yaml and ':' in text_sample:
+    # YAML detection — run the cheap structural checks first so the full
+    # yaml parse is only attempted on plausible candidates.
+    if yaml and ':' in text_sample and '\n' in text_sample and not text_sample.startswith('<'):
         try:
-            yaml.safe_load(text_sample)
-            if '\n' in text_sample and not text_sample.startswith('<'):
-                return 'yaml'
+            yaml.load(text_sample, Loader=_YAML_SAFE_LOADER)
+            return 'yaml'
         except Exception:
             pass
     
-    # HTML detection
-    if text_sample.startswith('<!DOCTYPE') or text_sample.startswith('<html'):
+    # HTML detection (tuple form dispatches both prefixes in one C call)
+    if text_sample.startswith(('<!DOCTYPE', '<html')):
         return 'html'
     
     # More lenient HTML detection
     if '<' in text_sample and '>' in text_sample:
-        tag_pattern = r'<[^>]+>'
-        # Even a single well-formed tag should be detected as HTML
-        if len(re.findall(tag_pattern, text_sample)) >= 1:
+        # Even a single well-formed tag should be detected as HTML; search
+        # stops at the first hit instead of materializing every match.
+        if _HTML_TAG_PATTERN.search(text_sample):
             return 'html'
-    
+
     # Markdown detection
-    markdown_patterns = [
-        r'^#{1,6}\s',          # Headers
-        r'\*\*[^*]+\*\*',      # Bold
-        r'\*[^*]+\*',          # Italic
-        r'\[([^\]]+)\]\([^)]+\)',  # Links
-        r'^\s*[-*+]\s',        # Lists
-        r'^\s*\d+\.\s',        # Numbered lists
-        r'^```',               # Code blocks
-        r'`[^`]+`',            # Inline code
-    ]
-    
-    for pattern in markdown_patterns:
-        if re.search(pattern, text_sample, re.MULTILINE):
+    for pattern in _MARKDOWN_PATTERNS:
+        if pattern.search(text_sample):
             return 'markdown'
     
     # Default to plain text
@@ -170,7 +178,6 @@ def parse_as_markdown(text_content: str) -> str:
 
 def parse_as_json(text_content: str) -> str:
     """Validate JSON content and return it unchanged if valid."""
-    import json
     # This will raise JSONDecodeError if invalid
     json.loads(text_content)
     # Return the original content unchanged
@@ -179,6 +186,9 @@ def parse_as_json(text_content: str) -> str:
 
 def parse_as_html(text_content: str) -> str:
     """Parse HTML content and extract text."""
+    # Deferred: bs4 is one of the slower imports and only this parser needs it.
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(text_content, 'html.parser')
     # Remove script and style elements
     for script in soup(["script", "style"]):
@@ -277,63 +287,68 @@ def is_within_depth(base_url: str, current_url: str, max_depth: int) -> bool:
 
 # ===== Path and File Type Utilities =====
 
+# Exclusion patterns folded into one alternation, compiled once: a single
+# regex scan per filename instead of up to twelve.
+_EXCLUDED_FILE_RE = re.compile(
+    r'\.pb\.go$'           # Protocol buffer generated files
+    r'|\.pb\.gw\.go$'      # Protocol buffer gateway files
+    r'|_test\.go$'         # Go test files
+    r'|\.min\.js$'         # Minified JavaScript
+    r'|\.min\.css$'        # Minified CSS
+    r'|__pycache__'        # Python cache
+    r'|\.pyc$'             # Python compiled files
+    r'|node_modules'       # Node.js modules
+    r'|vendor/'            # Vendor directories
+    r'|\.git/'             # Git directory
+    r'|dist/'              # Distribution directories
+    r'|build/'             # Build directories
+)
+
+
 def is_excluded_file(filename: str) -> bool:
     """
     Check if a file should be excluded based on common patterns.
-    
+
     Args:
         filename: Name of the file to check
-        
+
     Returns:
         True if file should be excluded, False otherwise
     """
-    excluded_patterns = [
-        r'\.pb\.go$',          # Protocol buffer generated files
-        r'\.pb\.gw\.go$',      # Protocol buffer gateway files
-        r'_test\.go$',         # Go test files
-        r'\.min\.js$',         # Minified JavaScript
-        r'\.min\.css$',        # Minified CSS
-        r'__pycache__',        # Python cache
-        r'\.pyc$',             # Python compiled files
-        r'node_modules',       # Node.js modules
-        r'vendor/',            # Vendor directories
-        r'\.git/',             # Git directory
-        r'dist/',              # Distribution directories
-        r'build/',             # Build directories
-    ]
-    
-    for pattern in excluded_patterns:
-        if re.search(pattern, filename):
-            return True
-    return False
+    return _EXCLUDED_FILE_RE.search(filename) is not None
+
+
+# Extensions allowed for processing. A tuple built once at import so
+# is_allowed_filetype is a single C-level endswith dispatch instead of a
+# per-call list rebuild plus a Python-level any() loop — it runs once per
+# directory entry during folder and repo traversal.
+ALLOWED_EXTENSIONS = (
+    '.py', '.txt', '.js', '.rst', '.sh', '.md', '.pyx', '.html', '.yaml', '.yml', '.pdf',
+    '.json', '.jsonl', '.ipynb', '.h', '.c', '.sql', '.csv', '.go', '.java',
+    '.cpp', '.hpp', '.cs', '.php', '.rb', '.swift', '.kt', '.ts', '.tsx', '.css',
+    '.jsx', '.vue', '.r', '.m', '.scala', '.rs', '.dart', '.lua', '.pl',
+    '.jl', '.mat', '.asm', '.s', '.pas', '.fs', '.ml', '.ex', '.clj',
+    '.hs', '.lsp', '.scm', '.nim', '.zig', '.d', '.ada', '.f90', '.cob',
+    '.vb', '.pro', '.v', '.sv', '.vhdl', '.tcl', '.elm', '.erl', '.hrl',
+    '.idr', '.agda', '.lean', '.coq', '.thy', '.sml', '.rkt', '.el', '.vim',
+    '.tex', '.bib', '.org', '.adoc', '.pod', '.rdoc', '.textile', '.wiki',
+    '.mediawiki', '.creole', '.mw', '.twiki', '.pmwiki', '.trac', '.doku',
+    '.cfg', '.conf', '.config', '.ini', '.toml', '.properties', '.env',
+    '.example', '.sample', '.default', '.dist', '.in', '.tpl', '.template'
+)
 
 
 def is_allowed_filetype(filename: str) -> bool:
     """
     Check if a file type is allowed for processing.
-    
+
     Args:
         filename: Name of the file to check
-        
+
     Returns:
         True if file type is allowed, False otherwise
     """
-    allowed_extensions = [
-        '.py', '.txt', '.js', '.rst', '.sh', '.md', '.pyx', '.html', '.yaml', '.yml', '.pdf',
-        '.json', '.jsonl', '.ipynb', '.h', '.c', '.sql', '.csv', '.go', '.java',
-        '.cpp', '.hpp', '.cs', '.php', '.rb', '.swift', '.kt', '.ts', '.tsx', '.css',
-        '.jsx', '.vue', '.r', '.m', '.scala', '.rs', '.dart', '.lua', '.pl',
-        '.jl', '.mat', '.asm', '.s', '.pas', '.fs', '.ml', '.ex', '.clj',
-        '.hs', '.lsp', '.scm', '.nim', '.zig', '.d', '.ada', '.f90', '.cob',
-        '.vb', '.pro', '.v', '.sv', '.vhdl', '.tcl', '.elm', '.erl', '.hrl',
-        '.idr', '.agda', '.lean', '.coq', '.thy', '.sml', '.rkt', '.el', '.vim',
-        '.tex', '.bib', '.org', '.adoc', '.pod', '.rdoc', '.textile', '.wiki',
-        '.mediawiki', '.creole', '.mw', '.twiki', '.pmwiki', '.trac', '.doku',
-        '.cfg', '.conf', '.config', '.ini', '.toml', '.properties', '.env',
-        '.example', '.sample', '.default', '.dist', '.in', '.tpl', '.template'
-    ]
-    
-    return any(filename.lower().endswith(ext) for ext in allowed_extensions)
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
 
 
 def escape_xml(text: str) -> str:
@@ -348,7 +363,9 @@ def escape_xml(text: str) -> str:
 
 def get_file_extension(filename: str) -> str:
     """Get the file extension from a filename."""
-    return Path(filename).suffix.lower()
+    # os.path.splitext avoids allocating a PurePath per call; this runs once
+    # per file during folder/repo traversal.
+    return os.path.splitext(filename)[1].lower()
 
 
 def is_binary_file(filepath: str) -> bool: